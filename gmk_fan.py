@@ -1,52 +1,124 @@
 #!/usr/bin/env python3
 import os
+import sys
 import time
-import struct
+import selectors
+import operator
+import atexit
+import threading
 
 EC_PATH = "/sys/kernel/debug/ec/ec0/io"
 
+# Speed register value -> PWM percentage for each fan
+FAN1_PCT_MAP = {34: 20, 35: 40, 36: 60, 37: 80, 38: 100}
+FAN2_PCT_MAP = {22: 100, 21: 80, 20: 60, 19: 40, 18: 20}
+SYSFAN_PCT_MAP = {54: 100, 53: 80, 52: 60, 51: 40, 50: 20}
+
+def _pct_lut(mapping):
+    """Expand a value->percent map into a 256-entry table indexed by raw byte"""
+    return bytes(mapping.get(i, 0) for i in range(256))
+
+FAN1_PCT_LUT = _pct_lut(FAN1_PCT_MAP)
+FAN2_PCT_LUT = _pct_lut(FAN2_PCT_MAP)
+SYSFAN_PCT_LUT = _pct_lut(SYSFAN_PCT_MAP)
+
+# Static parts of the status report
+_CONTROL_HELP = "\n".join([
+    "",
+    "=== Fan Control System ===",
+    "1. Fan 1: 0x23=33 (enable) + 0x24=34-38 (20-100%)",
+    "2. Fan 2: 0x21=17 (enable) + 0x22=18-22 (20-100%)",
+    "3. Sysfan: 0x25=49 (enable) + 0x26=50-54 (20-100%)",
+    "",
+])
+_RPM_MAPPINGS = "\n".join([
+    "",
+    "=== Your RPM Mappings ===",
+    "Fan 1 & 2: 0x0F=4000RPM, 0x0D=3200RPM, 0x0B=2400RPM, 0x09=1600RPM, 0x07=800RPM",
+    "Sysfan: 0x06=1900RPM, 0x05=1500RPM, 0x04=1200RPM, 0x03=800RPM, 0x02=400RPM",
+])
+
+# Full status report; only the numeric fields are filled in per refresh
+_STATUS_FMT = "\n".join([
+    "=== Complete Fan Status ===",
+    "Fan 1:   %4d RPM | PWM: %3d%% (0x24=%d) [Enable: 0x23=%d]",
+    "Fan 2:   %4d RPM | PWM: %3d%% (0x22=%d) [Enable: 0x21=%d]",
+    "Sysfan:  %4d RPM | PWM: %3d%% (0x26=%d) [Enable: 0x25=%d]",
+    _CONTROL_HELP.replace("%", "%%"),
+    "=== RPM Details (Your Exact Values) ===",
+    "Fan 1 RPM: 0x37 = %02X = %d RPM",
+    "Fan 2 RPM: 0x35 = %02X = %d RPM",
+    "Sysfan RPM: 0x28 = %02X = %d RPM",
+    _RPM_MAPPINGS.replace("%", "%%"),
+])
+
+_EC_FD = None
+_EC_LOCK = threading.Lock()
+_EC_BUF = bytearray(256)
+
+def _ec_fd():
+    """Open the EC io file once and reuse the descriptor"""
+    global _EC_FD
+    if _EC_FD is None:
+        with _EC_LOCK:
+            if _EC_FD is None:
+                _EC_FD = os.open(EC_PATH, os.O_RDWR)
+                atexit.register(_close_ec)
+    return _EC_FD
+
+def _close_ec():
+    global _EC_FD
+    if _EC_FD is not None:
+        os.close(_EC_FD)
+        _EC_FD = None
+
 def read_ec():
-    try:
-        with open(EC_PATH, "rb") as f:
-            return f.read(256)
-    except Exception as e:
-        print(f"Read failed: {e}")
-        return None
+    """Read the 256-byte EC window into a reused buffer
+
+    The returned buffer is overwritten by the next call. Errors are
+    raised to the caller so they can be shown as part of the report.
+    """
+    n = os.preadv(_ec_fd(), [_EC_BUF], 0)
+    return _EC_BUF if n == len(_EC_BUF) else _EC_BUF[:n]
 
 def write_ec(offset, value):
     """Write a byte to EC register"""
     try:
-        with open(EC_PATH, "r+b") as f:
-            f.seek(offset)
-            f.write(bytes([value & 0xFF]))
+        os.pwrite(_ec_fd(), bytes([value & 0xFF]), offset)
         return True
     except Exception as e:
         return False
 
-def get_byte(data, offset):
+def write_ec_block(offset, values):
+    """Write consecutive bytes to EC registers starting at offset"""
     try:
-        return data[offset]
-    except:
-        return 0
+        os.pwrite(_ec_fd(), bytes(v & 0xFF for v in values), offset)
+        return True
+    except Exception as e:
+        return False
 
-def get_rpm_little_endian(data, offset):
-    """Get RPM value as little-endian 16-bit"""
-    try:
-        return struct.unpack("<H", data[offset:offset+2])[0]
-    except:
-        return 0
+# Registers decoded from each EC snapshot, in decode_snapshot() order:
+# Fan 1/Fan 2/Sysfan RPM bytes, then enable/speed pairs for each fan
+_SNAPSHOT_OFFSETS = (0x37, 0x35, 0x28, 0x23, 0x24, 0x21, 0x22, 0x25, 0x26)
+_SNAPSHOT_MIN_LEN = max(_SNAPSHOT_OFFSETS) + 1
 
-def monitor_all_fans():
-    """Monitor all fans with your exact calculations"""
-    data = read_ec()
-    if not data:
-        print("Cannot read EC data")
-        return
+# Pull every field out of the snapshot in one call
+decode_snapshot = operator.itemgetter(*_SNAPSHOT_OFFSETS)
+
+def fan_status():
+    """Build the fan status report with your exact calculations"""
+    try:
+        data = read_ec()
+    except Exception as e:
+        return f"Read failed: {e}\nCannot read EC data"
+    if not data or len(data) < _SNAPSHOT_MIN_LEN:
+        return "Cannot read EC data"
 
     # Your exact RPM calculations
-    fan1_rpm_raw = get_byte(data, 0x37)  # Fan 1 RPM byte
-    fan2_rpm_raw = get_byte(data, 0x35)  # Fan 2 RPM byte
-    sysfan_rpm_raw = get_byte(data, 0x28)  # Sysfan RPM byte (0x28, not 0x29)
+    # Fan 1 RPM byte 0x37, Fan 2 RPM byte 0x35, Sysfan RPM byte 0x28 (not 0x29)
+    (fan1_rpm_raw, fan2_rpm_raw, sysfan_rpm_raw,
+     fan1_enable, fan1_speed, fan2_enable, fan2_speed,
+     sysfan_enable, sysfan_speed) = decode_snapshot(data)
 
     # Convert to actual RPM values based on your mapping
     # Fan 1 & 2: 0x0F = ~4000 RPM, 0x0D = ~3200 RPM, etc.
@@ -57,53 +129,42 @@ def monitor_all_fans():
     fan2_rpm = fan2_rpm_raw * 267  # 0x0F=15 * 267 = ~4000 RPM
     sysfan_rpm = sysfan_rpm_raw * 317  # 0x06=6 * 317 = ~1900 RPM
 
-    # Control Values
-    fan1_enable = get_byte(data, 0x23)
-    fan1_speed = get_byte(data, 0x24)
-    fan2_enable = get_byte(data, 0x21)
-    fan2_speed = get_byte(data, 0x22)
-    sysfan_enable = get_byte(data, 0x25)
-    sysfan_speed = get_byte(data, 0x26)
-
     # Calculate approximate percentages based on your mappings
-    fan1_pct_map = {34: 20, 35: 40, 36: 60, 37: 80, 38: 100}
-    fan2_pct_map = {22: 100, 21: 80, 20: 60, 19: 40, 18: 20}
-    sysfan_pct_map = {54: 100, 53: 80, 52: 60, 51: 40, 50: 20}
-
-    fan1_pct = fan1_pct_map.get(fan1_speed, 0)
-    fan2_pct = fan2_pct_map.get(fan2_speed, 0)
-    sysfan_pct = sysfan_pct_map.get(sysfan_speed, 0)
-
-    print("=== Complete Fan Status ===")
-    print(f"Fan 1:   {fan1_rpm:>4} RPM | PWM: {fan1_pct:3d}% (0x24={fan1_speed}) [Enable: 0x23={fan1_enable}]")
-    print(f"Fan 2:   {fan2_rpm:>4} RPM | PWM: {fan2_pct:3d}% (0x22={fan2_speed}) [Enable: 0x21={fan2_enable}]")
-    print(f"Sysfan:  {sysfan_rpm:>4} RPM | PWM: {sysfan_pct:3d}% (0x26={sysfan_speed}) [Enable: 0x25={sysfan_enable}]")
-    print()
-    print("=== Fan Control System ===")
-    print("1. Fan 1: 0x23=33 (enable) + 0x24=34-38 (20-100%)")
-    print("2. Fan 2: 0x21=17 (enable) + 0x22=18-22 (20-100%)")
-    print("3. Sysfan: 0x25=49 (enable) + 0x26=50-54 (20-100%)")
-    print()
-    print("=== RPM Details (Your Exact Values) ===")
-    print(f"Fan 1 RPM: 0x37 = {fan1_rpm_raw:02X} = {fan1_rpm} RPM")
-    print(f"Fan 2 RPM: 0x35 = {fan2_rpm_raw:02X} = {fan2_rpm} RPM")
-    print(f"Sysfan RPM: 0x28 = {sysfan_rpm_raw:02X} = {sysfan_rpm} RPM")
-    print()
-    print("=== Your RPM Mappings ===")
-    print("Fan 1 & 2: 0x0F=4000RPM, 0x0D=3200RPM, 0x0B=2400RPM, 0x09=1600RPM, 0x07=800RPM")
-    print("Sysfan: 0x06=1900RPM, 0x05=1500RPM, 0x04=1200RPM, 0x03=800RPM, 0x02=400RPM")
+    fan1_pct = FAN1_PCT_LUT[fan1_speed]
+    fan2_pct = FAN2_PCT_LUT[fan2_speed]
+    sysfan_pct = SYSFAN_PCT_LUT[sysfan_speed]
+
+    return _STATUS_FMT % (
+        fan1_rpm, fan1_pct, fan1_speed, fan1_enable,
+        fan2_rpm, fan2_pct, fan2_speed, fan2_enable,
+        sysfan_rpm, sysfan_pct, sysfan_speed, sysfan_enable,
+        fan1_rpm_raw, fan1_rpm,
+        fan2_rpm_raw, fan2_rpm,
+        sysfan_rpm_raw, sysfan_rpm,
+    )
+
+def monitor_all_fans():
+    """Monitor all fans with your exact calculations"""
+    print(fan_status())
+
+def _pct_step(percentage):
+    """Map a percentage to a 0-4 speed step, rounding up to the next 20%"""
+    return max(0, min(4, (percentage - 1) // 20))
+
+def _pct_step_nearest(percentage):
+    """Map a percentage to the nearest 0-4 speed step; ties round down"""
+    return max(0, min(4, (percentage - 11) // 20))
 
 def set_fan1_percentage(percentage):
     """Set Fan 1 speed"""
     print("Setting Fan 1...")
 
-    # Map percentage to Fan 1 values
-    fan1_mapping = {20: 34, 40: 35, 60: 36, 80: 37, 100: 38}
-    closest = min(fan1_mapping.keys(), key=lambda x: abs(x - percentage))
-    value = fan1_mapping[closest]
+    # Map percentage to Fan 1 values: 20%=34 ... 100%=38, nearest step
+    step = _pct_step_nearest(percentage)
+    closest = 20 + step * 20
+    value = 34 + step
 
-    write_ec(0x23, 33)  # Enable Fan 1 control
-    write_ec(0x24, value)
+    write_ec_block(0x23, (33, value))  # Enable Fan 1 control + speed
     print(f"Set Fan 1 to {closest}% (value: {value})")
 
 def set_fan2_percentage(percentage):
@@ -112,19 +173,9 @@ def set_fan2_percentage(percentage):
 
     # Map percentage to Fan 2 values (your exact mapping)
     # 22=100%, 21=80%, 20=60%, 19=40%, 18=20%
-    if percentage <= 20:
-        value = 18
-    elif percentage <= 40:
-        value = 19
-    elif percentage <= 60:
-        value = 20
-    elif percentage <= 80:
-        value = 21
-    else:
-        value = 22  # 100% = 22
-
-    write_ec(0x21, 17)  # Enable Fan 2 control (your exact value)
-    write_ec(0x22, value)
+    value = 18 + _pct_step(percentage)
+
+    write_ec_block(0x21, (17, value))  # Enable Fan 2 control (your exact value) + speed
     print(f"Set Fan 2 to {percentage}% (0x22={value}, 0x21=17)")
 
 def set_sysfan_percentage(percentage):
@@ -133,19 +184,9 @@ def set_sysfan_percentage(percentage):
 
     # Map percentage to Sysfan values (your exact mapping)
     # 54=100%, 53=80%, 52=60%, 51=40%, 50=20%
-    if percentage <= 20:
-        value = 50
-    elif percentage <= 40:
-        value = 51
-    elif percentage <= 60:
-        value = 52
-    elif percentage <= 80:
-        value = 53
-    else:
-        value = 54  # 100% = 54
-
-    write_ec(0x25, 49)  # Enable Sysfan control (your exact value)
-    write_ec(0x26, value)
+    value = 50 + _pct_step(percentage)
+
+    write_ec_block(0x25, (49, value))  # Enable Sysfan control (your exact value) + speed
     print(f"Set Sysfan to {percentage}% (0x26={value}, 0x25=49)")
 
 def set_auto_mode():
@@ -156,9 +197,55 @@ def set_auto_mode():
     write_ec(0x25, 48)  # Disable Sysfan manual control (your exact value)
     print("All fans set to auto mode")
 
+def clear_screen():
+    """Clear the terminal with ANSI escapes instead of spawning clear"""
+    sys.stdout.write("\x1b[H\x1b[2J")
+    sys.stdout.flush()
+
+def wait_for_enter(sel, timeout):
+    """Wait up to timeout seconds; return True if a line was entered on stdin
+
+    sel is a selector with stdin registered, or None when stdin can't be
+    polled (e.g. a regular file or /dev/null), in which case just sleep.
+    """
+    if sel is None:
+        time.sleep(timeout)
+        return False
+    deadline = time.monotonic() + timeout
+    while (remaining := deadline - time.monotonic()) > 0:
+        if sel.select(remaining):
+            sys.stdin.readline()
+            return True
+    return False
+
+def monitor_continuously(interval=2):
+    """Refresh fan status every interval seconds until Enter or Ctrl+C"""
+    sel = selectors.DefaultSelector()
+    try:
+        sel.register(sys.stdin, selectors.EVENT_READ)
+    except (PermissionError, ValueError):
+        sel.close()
+        sel = None
+    try:
+        last = None
+        while True:
+            status = fan_status()
+            # Only redraw when a reading actually changed
+            if status != last:
+                clear_screen()
+                print(status, flush=True)
+                last = status
+            if wait_for_enter(sel, interval):
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if sel is not None:
+            sel.close()
+
 def main():
     while True:
-        os.system('clear')
+        clear_screen()
         monitor_all_fans()
 
         print()
@@ -195,14 +282,8 @@ def main():
             elif choice == '5':
                 set_auto_mode()
             elif choice == '6':
-                print("Monitoring... Press Ctrl+C to return to menu")
-                try:
-                    while True:
-                        os.system('clear')
-                        monitor_all_fans()
-                        time.sleep(2)
-                except KeyboardInterrupt:
-                    pass
+                print("Monitoring... Press Enter or Ctrl+C to return to menu")
+                monitor_continuously()
         except KeyboardInterrupt:
             break
         except Exception as e: